@@ -514,11 +514,9 @@ def get_multiple_model_metrics(models_to_compare, output_for_pareto_comp):
             avg_across_folds=False,
         )
 
-        model_metrics[model_name] = (
-            df_metrics.xs(output_for_pareto_comp, level="Output_Name", axis=1)
-            .copy()
-            .astype("float")
-        )
+        model_metrics[model_name] = df_metrics.xs(
+            output_for_pareto_comp, level="Output_Name", axis=1
+        ).copy()
 
     return model_metrics
 
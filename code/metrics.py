@@ -23,6 +23,15 @@ import numpy as np
 import pandas as pd
 import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numba
+except ImportError:  # numba is optional; metrics then fall back to NumPy reductions
+    numba = None
+
+# converts int64 timestamps/timedeltas (ns) to hours
+HOURS_PER_NANOSECOND = 1 / (3600 * 1e9)
 
 
 # Define helper function to get validation set predictions from cross-validation fold masks
@@ -61,93 +70,171 @@ def get_validation_preds(pred_trainval, val_masks):
 
 
 # Define metrics
+# Every metric reduces along the first (time) axis, so that passing y_pred with one column per CV fold (and a matching
+# validation mask) evaluates all folds in a single vectorized call.
+
+
+def _masked_mean(x, mask=True):
+    """
+    Average x along the first (time) axis, only over samples selected by mask
+
+    Args:
+        x: Array (or Series) with samples along the first axis
+        mask: Boolean array broadcastable to x; True marks samples to include; default = True (all samples)
+
+    Returns:
+        Average of selected samples; one value per trailing column of x
+
+    """
+    x = np.asarray(x)
+    mask = np.broadcast_to(mask, x.shape)
+
+    # summing with where= skips unselected samples within the reduction itself, rather than materializing a copy of x
+    # with them zeroed out (or a compacted copy of the selected samples)
+    return np.add.reduce(x, axis=0, where=mask) / mask.sum(axis=0)
+
+
+def _as_float_arrays(*arrays):
+    """Converts inputs (e.g. Series) to float ndarrays, so that metrics skip pandas' index alignment and NaN handling"""
+    return [np.asarray(array, dtype=float) for array in arrays]
+
+
+# Helpers computing metrics from the difference between observed forecast errors and quantile estimates
+# (diff = y_true - y_pred), so that the difference is only computed once when evaluating multiple metrics
+
+
+def _coverage_from_diff(diff, mask=True, **kwargs):
+    """Coverage (see coverage) from diff = y_true - y_pred"""
+    return _masked_mean(diff <= 0, mask)
+
+
+def _closeness_from_diff(diff, mask=True, **kwargs):
+    """Closeness (see closeness) from diff = y_true - y_pred"""
+    # skip missing values, as pandas' mean does
+    return _masked_mean(np.abs(diff), mask & ~np.isnan(diff))
 
 
-def coverage(y_true, y_pred, **kwargs):
+def _exceedance_from_diff(diff, tau=0.975, mask=True, **kwargs):
+    """Exceedance (see exceedance) from diff = y_true - y_pred"""
+    exceeding = np.where(tau >= 0.5, diff >= 0, diff <= 0)
+    return _masked_mean(diff, exceeding & mask)
+
+
+def _max_exceedance_from_diff(diff, tau=0.975, mask=True, **kwargs):
+    """Maximum exceedance (see max_exceedance) from diff = y_true - y_pred"""
+    # flip sign of diff for tau below the median, so that the minimum is taken as a maximum
+    sign = np.where(tau >= 0.5, 1.0, -1.0)
+    # skip missing values, as pandas' max and min do
+    mask = np.broadcast_to(mask, diff.shape) & ~np.isnan(diff)
+    max_exceedance = sign * np.max(sign * diff, axis=0, where=mask, initial=-np.inf)
+
+    # return NaN rather than the initial infinity when no samples are selected, as for the other metrics
+    return np.where(mask.any(axis=0), max_exceedance, np.nan)
+
+
+def _pinball_loss_from_diff(diff, tau=0.975, mask=True, **kwargs):
+    """Pinball loss (see pinball_loss) from diff = y_true - y_pred"""
+    # equivalent to the average of max((tau - 1) * diff, tau * diff), but sums diff separately over samples above and
+    # below the quantile estimates and weighs the two sums, so that no scaled copy of diff is materialized
+    mask = np.broadcast_to(mask, diff.shape)
+    above = diff >= 0
+    loss = tau * np.add.reduce(diff, axis=0, where=above & mask) + (
+        tau - 1
+    ) * np.add.reduce(diff, axis=0, where=~above & mask)
+    return loss / mask.sum(axis=0)
+
+
+def coverage(y_true, y_pred, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Fraction of observed forecast errors that fall below / are "covered" by quantile estimates
 
     """
-    return (y_true <= y_pred).mean()
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return _coverage_from_diff(y_true - y_pred, mask)
 
 
-def requirement(y_true, y_pred, **kwargs):
+def requirement(y_true, y_pred, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Average reserve level/requirement, which corresponds to the average of the quantile estimates
 
     """
-    return y_pred.mean()
+    (y_pred,) = _as_float_arrays(y_pred)
+    # skip missing values, as pandas' mean does
+    return _masked_mean(y_pred, mask & ~np.isnan(y_pred))
 
 
-def closeness(y_true, y_pred, **kwargs):
+def closeness(y_true, y_pred, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Average (absolute) distance between observed forecast errors and quantile estimates; equivalent to mean average
             error (MAE) between observed forecast errors and quantile estimates
 
     """
-    return (y_true - y_pred).abs().mean()
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return _closeness_from_diff(y_true - y_pred, mask)
 
 
-def exceedance(y_true, y_pred, tau=0.975, **kwargs):
+def exceedance(y_true, y_pred, tau=0.975, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Average excess of observed forecast errors above (or below) the quantile estimates when observed forecast errors
         exceed corresponding quantile estimates
 
     """
-    if tau >= 0.5:
-        return ((y_true - y_pred)[y_true >= y_pred]).mean()
-    else:
-        return ((y_true - y_pred)[y_true <= y_pred]).mean()
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return _exceedance_from_diff(y_true - y_pred, tau, mask)
 
 
-def max_exceedance(y_true, y_pred, tau=0.975, **kwargs):
+def max_exceedance(y_true, y_pred, tau=0.975, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Maximum excess of observed forecast errors above (or below) corresponding quantile estimates
 
     """
-    if tau >= 0.5:
-        return (y_true - y_pred).max()
-    else:
-        return (y_true - y_pred).min()
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return _max_exceedance_from_diff(y_true - y_pred, tau, mask)
 
 
-def pinball_loss(y_true, y_pred, tau=0.975, **kwargs):
+def pinball_loss(y_true, y_pred, tau=0.975, mask=True, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
         tau: Target percentile for quantile estimates (needed within calculation); default = 0.975
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
 
     Returns:
         Average pinball loss of input data; similar to "closeness" metric, but samples are re-weighted so that the
@@ -156,31 +243,176 @@ def pinball_loss(y_true, y_pred, tau=0.975, **kwargs):
     """
     #     mask = ~(np.isnan(y_true) | np.isnan(y_pred))
     #     y_true, y_pred = y_true[mask], y_pred[mask]
-    return np.mean(
-        np.max(
-            np.array([(1 - tau) * (y_pred - y_true), tau * (y_true - y_pred)]), axis=0
-        )
-    )
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return _pinball_loss_from_diff(y_true - y_pred, tau, mask)
 
 
-def reserve_ramp_rate(y_true, y_pred, **kwargs):
+def reserve_ramp_rate(y_true, y_pred, mask=True, index=None, **kwargs):
     """
 
     Args:
         y_true: Time series of observed forecast errors
         y_pred: Time series of corresponding conditional quantile estimates from machine learning model
+        mask: Boolean mask selecting samples to evaluate (e.g. validation set of each CV fold); default = True
+        index: DatetimeIndex of the samples; default = None (use index of y_pred)
 
     Returns:
-        Average ramp rate of reserve level/requirement (average absolute rate of change)
+        Average ramp rate of reserve level/requirement (average absolute rate of change) between consecutive samples
+            selected by mask
 
     """
-    return np.mean(
-        np.abs(
-            (y_pred.values[1:] - y_pred.values[:-1])
-            / ((y_pred.index[1:] - y_pred.index[:-1]).total_seconds() / 3600)
-        )
+    if index is None:
+        index = y_pred.index
+    (y_pred,) = _as_float_arrays(y_pred)
+    trailing_axes = (1,) * (y_pred.ndim - 1)
+
+    # duration of time step between samples (in hours) if samples are evenly spaced; None otherwise. Durations are
+    # taken as absolute values, so that ramp rates stay positive for a descending index
+    index_ns = index.asi8  # int64 view of the index in nanoseconds, without conversion
+    steps = np.diff(index_ns)
+    step_hours = (
+        abs(steps[0]) * HOURS_PER_NANOSECOND
+        if len(steps) and (steps == steps[0]).all()
+        else None
     )
 
+    # evenly spaced samples without a mask: ramps are simply taken between adjacent samples over a single time step
+    if step_hours is not None and np.all(mask):
+        return np.mean(np.abs(np.diff(y_pred, axis=0)), axis=0) / step_hours
+
+    # locate the previous selected sample for each sample, so that ramps are only taken between consecutive samples
+    # that belong to the same mask (e.g. across day blocks of a validation set)
+    positions = np.arange(len(y_pred)).reshape((-1,) + trailing_axes)
+    prev = np.maximum.accumulate(np.where(mask, positions, -1), axis=0)
+    prev = np.concatenate([np.full_like(prev[:1], -1), prev[:-1]], axis=0)
+    has_prev = mask & (prev >= 0)
+    prev = np.maximum(prev, 0)
+    ramp_sizes = np.abs(y_pred - np.take_along_axis(y_pred, prev, axis=0))
+
+    # take durations of ramps as exact int64 differences, and convert them to hours with a single multiplication
+    ramp_hours = (
+        np.abs(index_ns.reshape((-1,) + trailing_axes) - index_ns[prev])
+        * HOURS_PER_NANOSECOND
+    )
+    ramps = ramp_sizes / np.where(has_prev, ramp_hours, 1)
+    return _masked_mean(ramps, has_prev)
+
+
+# Map metrics to their counterparts computed from the precomputed diff = y_true - y_pred
+_METRICS_FROM_DIFF = {
+    coverage: _coverage_from_diff,
+    closeness: _closeness_from_diff,
+    exceedance: _exceedance_from_diff,
+    max_exceedance: _max_exceedance_from_diff,
+    pinball_loss: _pinball_loss_from_diff,
+}
+
+# Metrics computed by _fused_metrics, in the order of its output
+_FUSED_METRICS = (
+    coverage,
+    requirement,
+    exceedance,
+    closeness,
+    max_exceedance,
+    pinball_loss,
+)
+
+
+def _fused_metrics(y_true, y_pred, mask, tau):
+    """
+    Computes all metrics in _FUSED_METRICS in a single pass over the data, so that each sample of y_true and y_pred is
+    loaded once for all metrics; compiled with numba when available
+
+    Args:
+        y_true: Array of observed forecast errors (samples,)
+        y_pred: Array of corresponding conditional quantile estimates (samples, tau, CV folds)
+        mask: Boolean array selecting the validation set of each CV fold (samples, CV folds)
+        tau: Array of target percentiles (tau,)
+
+    Returns:
+        Array of metrics (metrics, tau, CV folds), with metrics ordered as in _FUSED_METRICS
+
+    """
+    num_samples, num_taus, num_folds = y_pred.shape
+    sign = np.where(tau >= 0.5, 1.0, -1.0)  # direction of exceedance for each tau
+
+    num_selected = np.zeros(num_folds)
+    num_covered = np.zeros((num_taus, num_folds))
+    sum_pred = np.zeros((num_taus, num_folds))
+    num_valid_pred = np.zeros((num_taus, num_folds))
+    sum_exceedance = np.zeros((num_taus, num_folds))
+    num_exceeding = np.zeros((num_taus, num_folds))
+    sum_abs_diff = np.zeros((num_taus, num_folds))
+    num_valid_diff = np.zeros((num_taus, num_folds))
+    max_signed_exceedance = np.full((num_taus, num_folds), -np.inf)
+    sum_pinball_loss = np.zeros((num_taus, num_folds))
+
+    for i in range(num_samples):
+        for j in range(num_folds):
+            if mask[i, j]:
+                num_selected[j] += 1
+        for k in range(num_taus):
+            for j in range(num_folds):
+                if not mask[i, j]:
+                    continue
+                diff = y_true[i] - y_pred[i, k, j]
+                signed_diff = sign[k] * diff
+                if diff <= 0:
+                    num_covered[k, j] += 1
+                if signed_diff >= 0:
+                    sum_exceedance[k, j] += diff
+                    num_exceeding[k, j] += 1
+                # skip missing values in requirement, closeness and maximum exceedance, as the NumPy metrics do
+                if not np.isnan(y_pred[i, k, j]):
+                    sum_pred[k, j] += y_pred[i, k, j]
+                    num_valid_pred[k, j] += 1
+                if not np.isnan(diff):
+                    sum_abs_diff[k, j] += abs(diff)
+                    num_valid_diff[k, j] += 1
+                    if signed_diff > max_signed_exceedance[k, j]:
+                        max_signed_exceedance[k, j] = signed_diff
+                if diff >= 0:
+                    sum_pinball_loss[k, j] += tau[k] * diff
+                else:
+                    sum_pinball_loss[k, j] += (tau[k] - 1) * diff
+
+    values = np.empty((6, num_taus, num_folds))  # one row per metric in _FUSED_METRICS
+    for k in range(num_taus):
+        for j in range(num_folds):
+            values[0, k, j] = num_covered[k, j] / num_selected[j]
+            values[1, k, j] = sum_pred[k, j] / num_valid_pred[k, j]
+            values[2, k, j] = sum_exceedance[k, j] / num_exceeding[k, j]
+            values[3, k, j] = sum_abs_diff[k, j] / num_valid_diff[k, j]
+            # NaN rather than the initial infinity when no samples are selected, as for the other metrics
+            if num_valid_diff[k, j] > 0:
+                values[4, k, j] = sign[k] * max_signed_exceedance[k, j]
+            else:
+                values[4, k, j] = np.nan
+            values[5, k, j] = sum_pinball_loss[k, j] / num_selected[j]
+
+    return values
+
+
+if numba is not None:
+    # reassociation lets LLVM vectorize the accumulations; full fastmath is avoided as it assumes no infinities, which
+    # are used as the initial maximum exceedance, and no NaN, which are skipped explicitly
+    # releasing the GIL lets outputs be evaluated concurrently in threads
+    _fused_metrics = numba.njit(
+        cache=True, nogil=True, error_model="numpy", fastmath={"reassoc", "contract"}
+    )(_fused_metrics)
+
+
+# Metrics computed by default
+DEFAULT_METRICS = (
+    coverage,
+    requirement,
+    exceedance,
+    closeness,
+    max_exceedance,
+    reserve_ramp_rate,
+    pinball_loss,
+)
+
 
 # Define function to compute and write out metrics
 
@@ -191,15 +423,7 @@ def compute_metrics_for_specified_tau(
     df=None,
     tau=0.975,
     val_masks=None,
-    metrics=(
-        coverage,
-        requirement,
-        exceedance,
-        closeness,
-        max_exceedance,
-        reserve_ramp_rate,
-        pinball_loss,
-    ),
+    metrics=DEFAULT_METRICS,
 ):
     """
 
@@ -215,7 +439,8 @@ def compute_metrics_for_specified_tau(
         tau: Target percentile for predictions (also an input for pinball loss metric); default = 0.975
         filename: Path to file where metrics will be saved if filename specified; default = None
         val_masks: Array containing cross-validation fold validation set masks in rows
-        metrics: List of metrics to compute for input data
+        metrics: List of metrics to compute for input data; each metric reduces along the first (time) axis so that
+            all CV folds (and values of tau) are evaluated in a single call
 
     Returns:
         df: Dataframe containing metrics for current value of tau (and with metrics for other values of tau if existing
@@ -227,6 +452,7 @@ def compute_metrics_for_specified_tau(
         df_metrics = compute_metrics(output_trainval, pred_trainval)
 
         # Get metrics dataframe for target percentiles of 95% and 97.5% by passing previously computed dataframe
+        # (compute_metrics_for_all_taus computes all target percentiles at once, without growing a dataframe)
         df_metrics = compute_metrics(output_trainval, pred_trainval, tau = 0.95, df = df_metrics)
 
         # Save metrics dataframe to "file.csv"
@@ -234,82 +460,192 @@ def compute_metrics_for_specified_tau(
 
     """
 
-    CV_folds = pred_trainval.columns.levels[1]  # Define array of CV fold IDs
-    outputs = pred_trainval.columns.levels[
-        2
-    ]  # Define array of target outputs (load, net load, solar, wind)
+    new_df = _compute_metrics_for_taus(
+        output_trainval, pred_trainval, [tau], val_masks=val_masks, metrics=metrics
+    )
 
-    # Initialize dataframe if not passed to function in arguments
-    if df is None:
-        df = pd.DataFrame(
-            dtype="float"
-        )  # Create new dataframe if no existing dataframe is given
-        df["metrics"] = [metric.__name__ for metric in metrics]
-        df.set_index("metrics", inplace=True)  # Set index to list of metrics
-        df.index.name = None
+    # append to existing dataframe if one was passed to function in arguments
+    return new_df if df is None else pd.concat([df, new_df], axis=1)
+
+
+def _compute_metrics_for_output(y_true, y_pred, fold_masks, tau_arr, index, metrics):
+    """
+    Computes metrics of a single output for all values of tau and CV folds at once
+
+    Args:
+        y_true: Array of observed forecast errors (samples, 1, 1)
+        y_pred: Array of corresponding conditional quantile estimates (samples, tau, CV folds)
+        fold_masks: Boolean array selecting the validation set of each CV fold (samples, 1, CV folds)
+        tau_arr: Array of target percentiles (tau, 1)
+        index: DatetimeIndex of the samples
+        metrics: List of metrics to compute
+
+    Returns:
+        Dictionary mapping metric names to arrays of metrics (tau, CV folds)
+
+    """
+    # compute metrics covered by the compiled kernel in a single pass over the data, if numba is available
+    fused_values = {}
+    if numba is not None and any(metric in _FUSED_METRICS for metric in metrics):
+        fused_values = dict(
+            zip(
+                _FUSED_METRICS,
+                _fused_metrics(
+                    y_true[:, 0, 0], y_pred, fold_masks[:, 0, :], tau_arr[:, 0]
+                ),
+            )
+        )
+
+    # compute each metric for all values of tau and CV folds at once
+    diff = None
+    metric_values = {}
+    for metric in metrics:
+        if metric in fused_values:
+            metric_values[metric.__name__] = fused_values[metric]
+        elif metric in _METRICS_FROM_DIFF:
+            if diff is None:
+                # shared by all metrics that only depend on the difference
+                diff = y_true - y_pred
+            metric_values[metric.__name__] = _METRICS_FROM_DIFF[metric](
+                diff, tau=tau_arr, mask=fold_masks
+            )
+        else:
+            metric_values[metric.__name__] = metric(
+                y_true, y_pred, tau=tau_arr, mask=fold_masks, index=index
+            )
+
+    return metric_values
+
+
+def _compute_metrics_for_taus(
+    output_trainval,
+    pred_trainval,
+    taus,
+    val_masks=None,
+    metrics=DEFAULT_METRICS,
+    n_jobs=None,
+):
+    """
+    Computes metrics for multiple values of tau at once, broadcasting over (samples, tau, CV folds); see
+    compute_metrics_for_specified_tau for description of arguments
+
+    Args:
+        n_jobs: Number of threads evaluating outputs concurrently; default = None (ThreadPoolExecutor default)
+
+    Returns:
+        Dataframe containing metrics for given values of tau only
+    """
+
+    # Select predictions for given taus once; columns are (tau, CV fold ID, output)
+    tau_preds = pred_trainval.loc[:, list(taus)]
+    # Take CV fold IDs and outputs from the columns actually present, as levels of a sliced MultiIndex may be stale;
+    # CV fold IDs are sorted, as rows of val_masks belong to CV folds in sorted order
+    CV_folds = tau_preds.columns.unique(
+        level=1
+    ).sort_values()  # Define array of CV fold IDs
+    outputs = tau_preds.columns.unique(
+        level=2
+    )  # Define array of target outputs (load, net load, solar, wind)
+    num_samples = len(pred_trainval)
+    tau_arr = np.asarray(taus, dtype=float)[:, np.newaxis]  # (tau, 1)
 
     # default to using entire series if validation mask is not provided
     if val_masks is None:
-        val_masks = np.ones(CV_folds, len(pred_trainval))
-
-    # cycle through each of the output
-    for output in outputs:
-        # cycle through each of the CV fold to calculate metric
-        for j, CV in enumerate(CV_folds):
-
-            y_true = output_trainval[output].loc[
-                val_masks[j]
-            ]  # Define y_true (validation set)
-            y_pred = pred_trainval[(tau, CV, output)].loc[
-                val_masks[j]
-            ]  # Define y_pred (validation set)
-            df[(tau, CV, output)] = ""  # Create empty column to hold metrics
-
-            for metric in metrics:
-                df[(tau, CV, output)][metric.__name__] = metric(
-                    y_true, y_pred, tau=tau
-                )  # Compute metric
-
-    df = df.T.set_index(
-        pd.MultiIndex.from_tuples(
-            df.T.index, names=("Quantiles", "Fold ID", "Output_Name")
+        val_masks = np.ones((len(CV_folds), num_samples), dtype=bool)
+    # (samples, 1, CV folds); selects validation set of each CV fold, for all values of tau
+    fold_masks = val_masks.T[:, np.newaxis, :]
+
+    # extract arrays of each output up front, so that worker threads do not touch the dataframes
+    # cast to float, as prediction dataframes filled column by column are of object dtype
+    y_true = {
+        output: output_trainval[output].to_numpy(dtype=float)[:, np.newaxis, np.newaxis]
+        for output in outputs
+    }  # (samples, 1, 1)
+    y_pred = {
+        output: tau_preds.xs(output, axis=1, level=2)[
+            pd.MultiIndex.from_product([taus, CV_folds])
+        ]
+        .to_numpy(dtype=float)
+        .reshape(num_samples, len(taus), len(CV_folds))
+        for output in outputs
+    }  # (samples, tau, CV folds)
+
+    # outputs are independent of each other, and metrics are computed by NumPy reductions or the numba kernel, which
+    # release the GIL, so that outputs are evaluated concurrently in threads
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        metric_values = dict(
+            zip(
+                outputs,
+                executor.map(
+                    lambda output: _compute_metrics_for_output(
+                        y_true[output],
+                        y_pred[output],
+                        fold_masks,
+                        tau_arr,
+                        pred_trainval.index,
+                        metrics,
+                    ),
+                    outputs,
+                ),
+            )
         )
-    ).T  # Reformat to have multi-level columns
 
-    return df
+    # Build metrics dataframe in one go, with metrics in rows; columns are the product of taus, CV folds and outputs, in
+    # the same order as the predictions in pred_trainval
+    metric_names = [metric.__name__ for metric in metrics]
+    values = np.stack(
+        [
+            np.stack([metric_values[output][name] for name in metric_names])
+            for output in outputs
+        ],
+        axis=-1,
+    )  # (metrics, tau, CV folds, outputs)
+    new_df = pd.DataFrame(
+        values.reshape(len(metric_names), -1),
+        index=metric_names,
+        columns=pd.MultiIndex.from_product(
+            [taus, CV_folds, outputs], names=("Quantiles", "Fold ID", "Output_Name")
+        ),
+        dtype="float",
+    )
+
+    return new_df
 
 
 def compute_metrics_for_all_taus(
-    output_trainval, pred_trainval, val_masks=None, dir_str=None, avg_across_folds=True
+    output_trainval,
+    pred_trainval,
+    val_masks=None,
+    dir_str=None,
+    avg_across_folds=True,
+    n_jobs=None,
 ):
     """
     :param output_trainval:Dataframe of observed forecast errors
     :param pred_trainval: Dataframe of corresponding conditional quantile estimates from machine learning model for
             multiple CV folds and multiple tau. The columns are two leveled, with the sequence being (tau, CV)
     :param avg_across_folds: a boolean determining whether to return the metrics for each fold or the average
+    :param n_jobs: number of threads evaluating outputs concurrently; None uses the ThreadPoolExecutor default
     :return: Dataframe containing metrics for all values of tau present in the pred_trainval
     """
 
-    metrics_value_df = None
+    # compute metrics for all values of tau in a single sweep
+    metrics_value_df = _compute_metrics_for_taus(
+        output_trainval,
+        pred_trainval,
+        pred_trainval.columns.unique(level=0),
+        val_masks=val_masks,
+        n_jobs=n_jobs,
+    )
 
-    for tau in pred_trainval.columns.levels[0]:
-        metrics_value_df = compute_metrics_for_specified_tau(
-            output_trainval,
-            pred_trainval,
-            df=metrics_value_df,
-            tau=tau,
-            val_masks=val_masks,
-        )
     # write all metrics to hard drive
     if dir_str is not None:
         metrics_value_df.to_pickle(dir_str.metrics_path)  # Write to pkl file
 
     if avg_across_folds:
-        metrics_value_df = (
-            metrics_value_df.astype("float")
-            .groupby(axis=1, level=["Quantiles", "Output_Name"])
-            .mean()
-        )
+        metrics_value_df = metrics_value_df.groupby(
+            axis=1, level=["Quantiles", "Output_Name"]
+        ).mean()
 
     return metrics_value_df
 
@@ -327,34 +663,54 @@ def n_crossings(pred_trainval, filename=None):
             (only for valid pairs of "lower" and "upper" target percentiles)
     """
 
-    tau_arr = pred_trainval.columns.levels[0]  # Define array of tau (target quantiles)
-    CV_folds = pred_trainval.columns.levels[1]  # Define array of CV fold IDs
-    outputs = pred_trainval.columns.levels[
-        2
-    ]  # Define array of target outputs (load, net load, solar, wind)
+    # Take values from the columns actually present, as levels of a sliced MultiIndex may be stale
+    tau_arr = pred_trainval.columns.unique(
+        level=0
+    ).sort_values()  # Define array of tau (target quantiles)
+    CV_folds = pred_trainval.columns.unique(
+        level=1
+    ).sort_values()  # Define array of CV fold IDs
+    outputs = pred_trainval.columns.unique(
+        level=2
+    ).sort_values()  # Define array of target outputs (load, net load, solar, wind)
     num_samples = pred_trainval.shape[0]
 
-    crossings = {}  # Define dictionary to store crossings
-
-    for CV in CV_folds:
-        for output in outputs:
-            # Look for quantile crossings only in sets of predictions from models trained on same CV fold and predicting same target output
-            crossings[(CV, output)] = {}
-            for i, t1 in enumerate(tau_arr):
-                for j, t2 in enumerate(
-                    tau_arr[i + 1 :]
-                ):  # Only evaluate number of quantile crossings on valid lower/upper target percentile pairs
-                    crossings[(CV, output)][(t1, t2)] = (
-                        sum(
-                            pred_trainval[(t1, CV, output)]
-                            > pred_trainval[(t2, CV, output)]
-                        )
-                        / num_samples
-                    )  # Record number of quantile crossings
-
-    df = pd.DataFrame(crossings)
-    df.columns.names = ("CV Fold ID", "Output_Name")
-    df.index.rename(["Lower Quantile", "Upper Quantile"], inplace=True)
+    # Only evaluate number of quantile crossings on valid lower/upper target percentile pairs
+    lower_idx, upper_idx = np.triu_indices(len(tau_arr), k=1)
+
+    # Look for quantile crossings only in sets of predictions from models trained on same CV fold and predicting same
+    # target output; compare all pairs of target percentiles at once
+    crossing_fractions = np.empty(
+        (len(lower_idx), len(CV_folds), len(outputs))
+    )  # (tau pairs, CV folds, outputs)
+    for k, output in enumerate(outputs):
+        preds = (
+            pred_trainval.xs(output, axis=1, level=2)[
+                pd.MultiIndex.from_product([tau_arr, CV_folds])
+            ]
+            .to_numpy(dtype=float)
+            .reshape(num_samples, len(tau_arr), len(CV_folds))
+        )  # (samples, tau, CV folds)
+
+        # samples whose quantile estimates do not decrease with tau cannot cross for any pair of taus; find them in a
+        # single pass over adjacent taus, and only compare pairs of taus on the remaining samples
+        unsorted = ~(np.diff(preds, axis=1) >= 0).all(axis=(1, 2))
+        preds = preds[unsorted]
+        # Record number of quantile crossings
+        crossing_fractions[:, :, k] = (
+            preds[:, lower_idx, :] > preds[:, upper_idx, :]
+        ).sum(axis=0) / num_samples
+
+    df = pd.DataFrame(
+        crossing_fractions.reshape(len(lower_idx), -1),
+        index=pd.MultiIndex.from_arrays(
+            [tau_arr[lower_idx], tau_arr[upper_idx]],
+            names=("Lower Quantile", "Upper Quantile"),
+        ),
+        columns=pd.MultiIndex.from_product(
+            [CV_folds, outputs], names=("CV Fold ID", "Output_Name")
+        ),
+    )
 
     if filename != None:
         df.to_csv(filename)  # Write out to CSV file